@@ -1,7 +1,20 @@
-from flask import *
-from predict_user import func1
+import logging
+from flask import Flask, redirect, render_template, request, session, url_for
+from threading import Lock
+from uuid import uuid4
+from cachetools import TTLCache
+from predict_user import func1, prefetch_location
+logging.basicConfig(level=logging.INFO)  # DEBUG shows func1's per-day forecast report
 app=Flask(__name__)
 app.secret_key="somekey"
+# Forecast results are kept server-side for 30 min; the session cookie only carries their key
+RESULTS=TTLCache(maxsize=1024,ttl=1800)
+RESULTS_LOCK=Lock()
+
+def stored_result():
+    with RESULTS_LOCK:
+        return RESULTS.get(session.get('rid'))
+
 @app.route('/')#,methods=['GET','POST'])
 def base():
     #if request.method=='GET':
@@ -16,6 +29,9 @@ def performance():
     runtime=int(request.args['runtime'])
     cap=int(request.args['cap'])
     cur=int(request.args['cur'])
+    # Optional client-supplied location skips the IP geolocation lookup
+    lat=request.args.get('lat',type=float)
+    lon=request.args.get('lon',type=float)
     inputs={
     "fuel_type": fuel,
     "max_capacity_mw": cap,
@@ -23,20 +39,35 @@ def performance():
     "fuel_used_current": cur
     }
     #outputs=func1(inputs)
-    session["result"]=func1(inputs)
-    print(session["result"])
-    outputs=session['result'][0]
+    try:
+        result=func1(inputs,lat,lon)
+    except RuntimeError as e:
+        app.logger.error("%s", e)
+        return "Could not fetch weather data. Please check your internet connection or try again later.", 503
+    rid=uuid4().hex
+    with RESULTS_LOCK:
+        RESULTS[rid]=result
+    session['rid']=rid
+    app.logger.debug("Forecast result: %s", result)
+    outputs=result[0]
     return render_template('performance.html',fuel=outputs[2],gen=outputs[1],co2=outputs[5],fuelsaved=outputs[3],\
                            costsaved=outputs[4])
 
 @app.route('/analytics')
 def analytics():
-    outputs=session["result"]
+    outputs=stored_result()
+    if outputs is None:
+        return redirect(url_for('base'))
     return render_template('analytics.html',l=outputs)
 
 @app.route('/predictions')
 def predictions():
-    outputs=session["result"]
+    outputs=stored_result()
+    if outputs is None:
+        return redirect(url_for('base'))
     return render_template('predictions.html',l=outputs)
 
-app.run(host="0.0.0.0", port=5000,debug=True)
\ No newline at end of file
+if __name__=='__main__':
+    # Development server only; deploy with gunicorn (see README, gunicorn.conf.py)
+    prefetch_location()
+    app.run(host="0.0.0.0", port=5000,debug=False)
\ No newline at end of file
@@ -1,8 +1,8 @@
 import csv
 import os
-import random
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+from numba import float64, vectorize
 
 CSV_FILE = "plant_data.csv"
 BACKUP_CSV_FILE = "backup.csv"
@@ -15,10 +15,67 @@ HEADERS = [
     "fuel_saved", "fuel_cost_per_unit", "cost_saved", "co2_saved_tonnes"
 ]
 
-# Always overwrite CSVs with correct headers
-for fname in [CSV_FILE, BACKUP_CSV_FILE]:
-    with open(fname, mode="w", newline="") as file:
-        csv.writer(file).writerow(HEADERS)
+# Reference date for plant aging
+EPOCH = np.datetime64("2020-01-01")
+
+# Season for each month, indexed by month - 1
+SEASON_TABLE = np.array([
+    'winter', 'winter', 'spring', 'spring', 'spring', 'summer',
+    'summer', 'summer', 'autumn', 'autumn', 'autumn', 'winter'
+])
+
+# Angular frequency of the daily temperature cycle, radians per hour
+_DAILY_OMEGA = 2 * np.pi / 24
+
+
+@vectorize([float64(float64, float64, float64, float64, float64, float64,
+                     float64, float64, float64, float64, float64, float64)])
+def _efficiency_core(base_efficiency, temp_sensitivity, humidity_sensitivity, pressure_sensitivity,
+                     min_eff, max_eff, temp_C, humidity, pressure_hPa, run_hours, days_since_start, load_factor):
+    # Apply load factor (plants are more efficient near 80-90% capacity)
+    base_efficiency = base_efficiency * (1 - abs(load_factor - 0.9) * 0.08)
+
+    # Runtime effect
+    if run_hours < 4:
+        hours_factor = 0.95
+    elif run_hours < 8:
+        hours_factor = 0.98
+    else:
+        hours_factor = 1.0 + 0.00005 * (run_hours - 8)
+
+    # Environmental factors, paired so the products form independent chains
+    env_a = (1 - temp_sensitivity * (temp_C - 25)) * (1 - humidity_sensitivity * (humidity - 40))
+    env_b = (1 + pressure_sensitivity * (pressure_hPa - 1013.25)) * hours_factor
+
+    # Aging effect
+    degradation_factor = 1 - (days_since_start * 0.00005)
+
+    # Combine
+    efficiency = (base_efficiency * degradation_factor) * (env_a * env_b)
+
+    # Clip to range
+    return max(min_eff, min(max_eff, efficiency))
+
+
+def _fuel_constants(config):
+    """(lhv_effective, co2_scale) for the shared fuel/CO2 formula, derived from a fuel_types entry."""
+    if config['fuel_unit'] == 'barrel':  # oil is metered by volume: kcal/liter, liters → tonnes
+        return config['fuel_lhv'] * config['density'], config['co2_factor'] * config['density'] / 1000
+    if config['fuel_unit'] == '1000Nm3':  # co2_factor is per 1000 Nm3
+        return config['fuel_lhv'], config['co2_factor'] / 1000
+    return config['fuel_lhv'], config['co2_factor']
+
+
+# Float output columns, grouped so each rounding class is a contiguous slice
+FLOAT_COLUMNS = [
+    "max_capacity_mw", "temp_C", "humidity_%", "pressure_hPa", "adjustment_pct",
+    "heat_rate_kcal_per_kwh", "fuel_cost_per_unit", "cost_saved",
+    "current_generation_mw", "recommended_generation_mw",
+    "predicted_efficiency", "fuel_per_kwh", "fuel_used_current",
+    "fuel_used_recommended", "fuel_saved", "co2_saved_tonnes"
+]
+ROUNDING = [(2, slice(0, 8)), (3, slice(8, 10)), (4, slice(10, 16))]
+FLOAT_INDEX = [HEADERS.index(col) for col in FLOAT_COLUMNS]
 
 class MultiFuelPlantGenerator:
     def __init__(self):
@@ -31,7 +88,7 @@ class MultiFuelPlantGenerator:
                 'humidity_sensitivity': 0.0008,
                 'pressure_sensitivity': 0.0006,
                 'fuel_lhv': 7000,  # kcal/kg
-                'fuel_unit': 'kg',
+                'fuel_unit': 'ton',  # unit of the fuel_used_* / fuel_saved columns
                 'fuel_cost_range': (5000, 7000),  # per ton
                 'co2_factor': 2.42,  # tonnes CO2 per tonne coal
                 'density': 1.0,
@@ -44,7 +101,7 @@ class MultiFuelPlantGenerator:
                 'humidity_sensitivity': 0.0007,
                 'pressure_sensitivity': 0.0005,
                 'fuel_lhv': 10000,  # kcal/kg
-                'fuel_unit': 'liters',
+                'fuel_unit': 'barrel',  # unit of the fuel_used_* / fuel_saved columns
                 'fuel_cost_range': (600, 900),  # per barrel (159 liters)
                 'co2_factor': 2.96,  # tonnes CO2 per tonne oil
                 'density': 0.85,  # kg/liter
@@ -57,145 +114,129 @@ class MultiFuelPlantGenerator:
                 'humidity_sensitivity': 0.0005,
                 'pressure_sensitivity': 0.0008,
                 'fuel_lhv': 8500,  # kcal/Nm3
-                'fuel_unit': 'Nm3',
+                'fuel_unit': '1000Nm3',  # unit of the fuel_used_* / fuel_saved columns
                 'fuel_cost_range': (200, 400),  # per 1000 Nm3
                 'co2_factor': 2.0,  # tonnes CO2 per 1000 Nm3
                 'density': 0.72,
             }
         }
+        for config in self.fuel_types.values():
+            config['lhv_effective'], config['co2_scale'] = _fuel_constants(config)
         self.seasonal_temp_base = {
             'winter': 15, 'spring': 22, 'summer': 32, 'autumn': 25
         }
-
-    def get_seasonal_temperature(self, timestamp):
-        dt = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
-        month = dt.month
-        if month in [12, 1, 2]:
-            season = 'winter'
-        elif month in [3, 4, 5]:
-            season = 'spring'
-        elif month in [6, 7, 8]:
-            season = 'summer'
-        else:
-            season = 'autumn'
-        base_temp = self.seasonal_temp_base[season]
-        daily_variation = 6 * np.sin(2 * np.pi * dt.hour / 24)  # daily cycle
-        random_noise = random.uniform(-1, 1)  # smaller noise
+        self.monthly_temp_base = np.array([self.seasonal_temp_base[season] for season in SEASON_TABLE])
+        self.rng = np.random.default_rng()
+
+    def get_seasonal_temperature(self, dt):
+        month_idx = dt.astype("datetime64[M]").astype(int) % 12  # month - 1
+        hour = dt.astype("datetime64[h]").astype(int) % 24
+        base_temp = self.monthly_temp_base[month_idx]
+        daily_variation = 6 * np.sin(_DAILY_OMEGA * hour)  # daily cycle
+        random_noise = self.rng.uniform(-1, 1, size=len(dt))  # smaller noise
         return base_temp + daily_variation + random_noise
 
-    def calculate_efficiency(self, config, temp_C, humidity, pressure_hPa, run_hours, timestamp, load_factor):
+    def calculate_efficiency(self, config, temp_C, humidity, pressure_hPa, run_hours, dt, load_factor):
         # Start at midpoint efficiency
         base_efficiency = np.mean(config['efficiency_range'])
+        min_eff, max_eff = config['efficiency_range']
+        days_since_start = (dt.astype("datetime64[D]") - EPOCH).astype(int)
 
-        # Apply load factor (plants are more efficient near 80-90% capacity)
-        load_factor_adj = 1 - abs(load_factor - 0.9) * 0.08
-        base_efficiency *= load_factor_adj
+        efficiency = _efficiency_core(
+            base_efficiency, config['temp_sensitivity'], config['humidity_sensitivity'],
+            config['pressure_sensitivity'], min_eff, max_eff,
+            temp_C, humidity, pressure_hPa, run_hours, days_since_start, load_factor
+        )
 
-        # Apply environmental factors
-        temp_factor = 1 - config['temp_sensitivity'] * (temp_C - 25)
-        humidity_factor = 1 - config['humidity_sensitivity'] * (humidity - 40)
-        pressure_factor = 1 + config['pressure_sensitivity'] * (pressure_hPa - 1013.25)
+        # Small noise
+        efficiency *= self.rng.uniform(0.995, 1.005, size=efficiency.shape)
+
+        return np.round(efficiency, 4)
+
+    def _fuel_block(self, fuel_type, dt, timestamp_str):
+        """Rows for one fuel type as an (n, len(HEADERS)) object array, in HEADERS column order."""
+        n = len(dt)
+        config = self.fuel_types[fuel_type]
+
+        max_capacity_mw = self.rng.uniform(*config['capacity_range'], size=n)
+        temp_C = self.get_seasonal_temperature(dt)
+        humidity = self.rng.uniform(30, 70, size=n)  # narrower realistic band
+        pressure_hPa = 1013.25 + self.rng.uniform(-10, 10, size=n)
+
+        run_hours = self.rng.integers(12, 24, size=n, endpoint=True)  # longer average operation
+        load_factor = self.rng.uniform(0.6, 1.0, size=n)  # realistic load
+
+        predicted_efficiency = self.calculate_efficiency(
+            config, temp_C, humidity, pressure_hPa, run_hours, dt, load_factor
+        )
+
+        base_generation = max_capacity_mw * predicted_efficiency
+        current_generation_mw = max_capacity_mw * load_factor
+
+        heat_rate_kcal_per_kwh = 860 / predicted_efficiency
+
+        # Fuel calculations (per-fuel unit conversions are folded into lhv_effective / co2_scale)
+        fuel_per_kwh = heat_rate_kcal_per_kwh / config['lhv_effective']
+        fuel_used_current = (current_generation_mw * 1000) * fuel_per_kwh * run_hours / 1000
+        fuel_used_recommended = (base_generation * 1000) * fuel_per_kwh * run_hours / 1000
+        fuel_cost_per_unit = self.rng.uniform(*config['fuel_cost_range'], size=n)
+
+        adjustment_pct = (base_generation - current_generation_mw) / max_capacity_mw * 100
+        fuel_saved = fuel_used_current - fuel_used_recommended
+        cost_saved = fuel_saved * fuel_cost_per_unit
+        co2_saved = fuel_saved * config['co2_scale']
+
+        # Float columns grouped by rounding class; see FLOAT_COLUMNS
+        arr = np.column_stack([
+            max_capacity_mw, temp_C, humidity, pressure_hPa, adjustment_pct,
+            heat_rate_kcal_per_kwh, fuel_cost_per_unit, cost_saved,
+            current_generation_mw, base_generation,
+            predicted_efficiency, fuel_per_kwh, fuel_used_current,
+            fuel_used_recommended, fuel_saved, co2_saved
+        ])
+        for decimals, cols in ROUNDING:
+            np.round(arr[:, cols], decimals, out=arr[:, cols])
+
+        table = np.empty((n, len(HEADERS)), dtype=object)
+        table[:, FLOAT_INDEX] = arr.astype(object)
+        table[:, HEADERS.index("timestamp")] = timestamp_str.astype(object)
+        table[:, HEADERS.index("fuel_type")] = fuel_type
+        table[:, HEADERS.index("fuel_unit")] = config['fuel_unit']
+        table[:, HEADERS.index("run_hours")] = run_hours.astype(object)
+        return table
 
-        # Runtime effect
-        if run_hours < 4:
-            hours_factor = 0.95
-        elif run_hours < 8:
-            hours_factor = 0.98
-        else:
-            hours_factor = 1.0 + 0.00005 * (run_hours - 8)
+    def generate_realistic_data(self, num_samples=50):
+        fuel_types = list(self.fuel_types)
+        if not fuel_types or num_samples <= 0:
+            return []
 
-        # Aging effect
-        days_since_start = (datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S") - datetime(2020, 1, 1)).days
-        degradation_factor = 1 - (days_since_start * 0.00005)
+        now = np.datetime64(datetime.now(), "s")
+        dt = now - np.timedelta64(1, "h") * (num_samples - np.arange(num_samples))
+        timestamp_str = np.char.replace(np.datetime_as_string(dt, unit="s"), "T", " ")
 
-        # Combine
-        efficiency = base_efficiency * temp_factor * humidity_factor * pressure_factor * hours_factor * degradation_factor
+        blocks = [self._fuel_block(fuel_type, dt, timestamp_str) for fuel_type in fuel_types]
 
-        # Clip to range
-        min_eff, max_eff = config['efficiency_range']
-        efficiency = max(min_eff, min(max_eff, efficiency))
+        # Interleave fuel blocks so rows stay ordered by timestamp, then fuel type
+        return np.stack(blocks, axis=1).reshape(-1, len(HEADERS)).tolist()
 
-        # Small noise
-        efficiency *= random.uniform(0.995, 1.005)
+def append_rows(rows, fnames=(CSV_FILE, BACKUP_CSV_FILE)):
+    """Append generated rows to each CSV in a single buffered write (headers: see _ensure_headers)."""
+    for fname in fnames:
+        with open(fname, mode="a", newline="", buffering=1 << 20) as file:
+            csv.writer(file).writerows(rows)
 
-        return round(efficiency, 4)
 
-    def generate_realistic_data(self, num_samples=50):
-        data = []
-        fuel_types = list(self.fuel_types.keys())
-        for i in range(num_samples):
-            timestamp = datetime.now() - timedelta(hours=num_samples - i)
-            timestamp_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-            for fuel_type in fuel_types:
-                config = self.fuel_types[fuel_type]
-                max_capacity_mw = random.uniform(*config['capacity_range'])
-                temp_C = self.get_seasonal_temperature(timestamp_str)
-                humidity = random.uniform(30, 70)  # narrower realistic band
-                pressure_hPa = 1013.25 + random.uniform(-10, 10)
-
-                run_hours = random.randint(12, 24)  # longer average operation
-                load_factor = random.uniform(0.6, 1.0)  # realistic load
-
-                predicted_efficiency = self.calculate_efficiency(
-                    config, temp_C, humidity, pressure_hPa, run_hours, timestamp_str, load_factor
-                )
-
-                base_generation = max_capacity_mw * predicted_efficiency
-                current_generation_mw = max_capacity_mw * load_factor
-
-                heat_rate_kcal_per_kwh = 860 / predicted_efficiency
-
-                # Fuel-specific calculations
-                if fuel_type == 'coal':
-                    fuel_per_kwh = heat_rate_kcal_per_kwh / config['fuel_lhv']  # kg/kWh
-                    fuel_used_current = (current_generation_mw * 1000) * fuel_per_kwh * run_hours / 1000  # tonnes
-                    fuel_used_recommended = (base_generation * 1000) * fuel_per_kwh * run_hours / 1000
-                    fuel_cost_per_unit = random.uniform(*config['fuel_cost_range'])
-                    fuel_unit = 'ton'
-                    co2_saved = (fuel_used_current - fuel_used_recommended) * config['co2_factor']
-                elif fuel_type == 'oil':
-                    fuel_per_kwh = heat_rate_kcal_per_kwh / (config['fuel_lhv'] * config['density'])  # liters/kWh
-                    fuel_used_current = (current_generation_mw * 1000) * fuel_per_kwh * run_hours / 1000  # m3
-                    fuel_used_recommended = (base_generation * 1000) * fuel_per_kwh * run_hours / 1000
-                    fuel_cost_per_unit = random.uniform(*config['fuel_cost_range'])
-                    fuel_unit = 'barrel'
-                    fuel_used_current_tonnes = fuel_used_current * config['density'] / 1000
-                    fuel_used_recommended_tonnes = fuel_used_recommended * config['density'] / 1000
-                    co2_saved = (fuel_used_current_tonnes - fuel_used_recommended_tonnes) * config['co2_factor']
-                elif fuel_type == 'natural_gas':
-                    fuel_per_kwh = heat_rate_kcal_per_kwh / config['fuel_lhv']  # Nm3/kWh
-                    fuel_used_current = (current_generation_mw * 1000) * fuel_per_kwh * run_hours / 1000  # 1000 Nm3
-                    fuel_used_recommended = (base_generation * 1000) * fuel_per_kwh * run_hours / 1000
-                    fuel_cost_per_unit = random.uniform(*config['fuel_cost_range'])
-                    fuel_unit = '1000Nm3'
-                    co2_saved = (fuel_used_current - fuel_used_recommended) * config['co2_factor'] / 1000
-                else:
-                    continue
-
-                adjustment_pct = (base_generation - current_generation_mw) / max_capacity_mw * 100
-                fuel_saved = fuel_used_current - fuel_used_recommended
-                cost_saved = fuel_saved * fuel_cost_per_unit
-
-                data.append([
-                    timestamp_str,
-                    fuel_type,
-                    round(max_capacity_mw, 2),
-                    round(current_generation_mw, 3),
-                    run_hours,
-                    round(temp_C, 2),
-                    round(humidity, 2),
-                    round(pressure_hPa, 2),
-                    predicted_efficiency,
-                    round(base_generation, 3),
-                    round(adjustment_pct, 2),
-                    round(fuel_per_kwh, 4),
-                    fuel_unit,
-                    round(heat_rate_kcal_per_kwh, 2),
-                    round(fuel_used_current, 4),
-                    round(fuel_used_recommended, 4),
-                    round(fuel_saved, 4),
-                    round(fuel_cost_per_unit, 2),
-                    round(cost_saved, 2),
-                    round(co2_saved, 4)
-                ])
-        return data
+def _ensure_headers(fnames=(CSV_FILE, BACKUP_CSV_FILE)):
+    """Write the header row to any CSV that is missing or empty; existing data is kept."""
+    for fname in fnames:
+        if os.path.exists(fname) and os.stat(fname).st_size > 0:
+            continue
+        with open(fname, mode="w", newline="") as file:
+            csv.writer(file).writerow(HEADERS)
+
+
+if __name__ == "__main__":
+    _ensure_headers()
+    rows = MultiFuelPlantGenerator().generate_realistic_data()
+    append_rows(rows)
+    print(f"Appended {len(rows)} rows to {CSV_FILE} and {BACKUP_CSV_FILE}")
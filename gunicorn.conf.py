@@ -0,0 +1,7 @@
+# Loaded automatically by gunicorn from the working directory (see README)
+
+
+def post_fork(server, worker):
+    # Warm the geolocation cache in each worker; threads started before the fork would not survive it
+    from predict_user import prefetch_location
+    prefetch_location()
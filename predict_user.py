@@ -1,12 +1,49 @@
+import functools
+import logging
+import math
+import threading
+import time
 import joblib
-import pandas as pd
+import numpy as np
 import requests
+from numba import float64, vectorize
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+# Shared keep-alive session so repeat requests skip the TCP/TLS handshake.
+# Keep HTTP_POOL_SIZE >= the gunicorn --threads count in the README, or concurrent
+# requests past the pool size open throwaway connections ("Connection pool is full").
+HTTP_POOL_SIZE = 32
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE))
+
+# Per-fuel constants, indexed by FUEL_IDS; the last entry is the fallback for unknown fuels
+FUEL_IDS = {"coal": 0, "oil": 1, "natural_gas": 2}
+DEFAULT_FUEL_ID = 3
+BASE_EFF = (0.38, 0.42, 0.50, 0.40)
+FUEL_PER_KWH = (0.35, 0.25, 0.20, 0.3)
+FUEL_COST = (6000, 700, 300, 500)
+CO2_FACTOR = (2.42, 2.96, 2.0, 2.5)
+
+GPS_CACHE_TTL = 60 * 60  # seconds; server IP rarely moves
+WEATHER_CACHE_TTL = 15 * 60  # seconds
+
+
+def _ttl_hash(seconds):
+    """Value that changes every `seconds`; passed to lru_cache'd functions to expire entries."""
+    return int(time.time() // seconds)
 
 
 def get_gps_location():
     """Get user's current location (lat, lon) using IP-based geolocation (fallback safe)."""
+    return _cached_gps_location(_ttl_hash(GPS_CACHE_TTL))
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_gps_location(ttl_hash):
     try:
-        resp = requests.get("https://ipinfo.io/json", timeout=10)
+        resp = _SESSION.get("https://ipinfo.io/json", timeout=10)
         resp.raise_for_status()
         data = resp.json()
         lat, lon = map(float, data["loc"].split(","))
@@ -15,8 +52,24 @@ def get_gps_location():
         raise RuntimeError(f"❌ Could not fetch GPS location: {e}")
 
 
+def prefetch_location():
+    """Warm the geolocation cache in a background thread so requests only wait on the weather fetch."""
+    def _prefetch():
+        try:
+            get_gps_location()
+        except RuntimeError:
+            pass  # func1 retries and falls back on its own
+    threading.Thread(target=_prefetch, daemon=True).start()
+
+
 def fetch_weather_forecast(lat, lon, days=7):
     """Fetch weather data from Open-Meteo (no API key needed)."""
+    forecast = _cached_weather_forecast(round(lat, 2), round(lon, 2), days, _ttl_hash(WEATHER_CACHE_TTL))
+    return [dict(day) for day in forecast]
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_weather_forecast(lat, lon, days, ttl_hash):
     url = (
         f"https://api.open-meteo.com/v1/forecast?"
         f"latitude={lat}&longitude={lon}"
@@ -24,7 +77,7 @@ def fetch_weather_forecast(lat, lon, days=7):
         f"&pressure_msl"  # mean sea level pressure
         f"&timezone=auto"
     )
-    resp = requests.get(url, timeout=10)
+    resp = _SESSION.get(url, timeout=10)
     resp.raise_for_status()
     data = resp.json()
 
@@ -47,54 +100,66 @@ def fetch_weather_forecast(lat, lon, days=7):
     return forecast
 
 
-def calc_recommended_efficiency(fuel_type, temp_C, humidity, pressure_hPa):
-    base_eff = {"coal": 0.38, "oil": 0.42, "natural_gas": 0.50}.get(fuel_type, 0.40)
+@vectorize([float64(float64, float64, float64, float64)])
+def _recommended_efficiency_core(base_eff, temp_C, humidity, pressure_hPa):
     temp_factor = 1 - 0.002 * (temp_C - 25)
     humidity_factor = 1 - 0.001 * (humidity - 40)
     pressure_factor = 1 + 0.0005 * (pressure_hPa - 1013.25)
     return base_eff * temp_factor * humidity_factor * pressure_factor
 
 
-def predict_outputs(input_data):
-    fuel_type = input_data['fuel_type']
+def calc_recommended_efficiency(fuel_type, temp_C, humidity, pressure_hPa):
+    base_eff = BASE_EFF[FUEL_IDS.get(fuel_type, DEFAULT_FUEL_ID)]
+    return _recommended_efficiency_core(base_eff, temp_C, humidity, pressure_hPa)
+
+
+class DummyModel:
+    """Fallback when no trained model exists: 70% of max capacity (first feature)."""
+    def predict(self, X):
+        return np.asarray(X, dtype=float)[:, 0] * 0.7
+
+
+@functools.lru_cache(maxsize=8)
+def _load_model(fuel_type):
+    """Load the model for a fuel type once per process (failures are cached too)."""
     try:
-        model = joblib.load(f"model_{fuel_type}.joblib")
+        return joblib.load(f"model_{fuel_type}.joblib")
     except Exception:
-        print(f"⚠️ No model found for {fuel_type}, using dummy output.")
-        class DummyModel:
-            def predict(self, X): return [input_data["max_capacity_mw"] * 0.7]
-        model = DummyModel()
+        log.warning("⚠️ No model found for %s, using dummy output.", fuel_type)
+        return DummyModel()
+
+
+FEATURES = ["max_capacity_mw", "run_hours", "temp_C", "humidity_%", "pressure_hPa"]
 
-    features = ["max_capacity_mw", "run_hours", "temp_C", "humidity_%", "pressure_hPa"]
-    X = pd.DataFrame([[input_data[feat] for feat in features]], columns=features)
-    current_generation_mw = model.predict(X)[0]
 
-    max_capacity = input_data["max_capacity_mw"]
-    run_hours = input_data["run_hours"]
+def feature_matrix(rows):
+    """Stack input dicts into a float64 array with one column per FEATURES entry."""
+    return np.asarray([[row[feat] for feat in FEATURES] for row in rows], dtype=np.float64)
 
-    # User-provided current fuel use
-    fuel_used_current = input_data["fuel_used_current"]
+
+def predict_batch(fuel_type, X, fuel_used_current):
+    """Vectorized predict_outputs: one model.predict call, one output array per key for all rows of X."""
+    model = _load_model(fuel_type)
+    fuel_id = FUEL_IDS.get(fuel_type, DEFAULT_FUEL_ID)
+    current_generation_mw = model.predict(X)
+
+    max_capacity, run_hours, temp_C, humidity, pressure_hPa = X.T
 
     # Recommended scenario (weather-dependent)
-    recommended_efficiency = calc_recommended_efficiency(
-        fuel_type, input_data["temp_C"], input_data["humidity_%"], input_data["pressure_hPa"]
-    )
+    recommended_efficiency = calc_recommended_efficiency(fuel_type, temp_C, humidity, pressure_hPa)
     recommended_generation_mw = max_capacity * recommended_efficiency
     recommended_energy_kwh = recommended_generation_mw * 1000 * run_hours
 
-    fuel_per_kwh_map = {"coal": 0.35, "oil": 0.25, "natural_gas": 0.20}
-    fuel_per_kwh = fuel_per_kwh_map.get(fuel_type, 0.3)
+    fuel_per_kwh = FUEL_PER_KWH[fuel_id]
     fuel_used_recommended = recommended_energy_kwh * fuel_per_kwh / 1000
 
     # Savings
     fuel_saved = fuel_used_current - fuel_used_recommended
 
-    fuel_cost_map = {"coal": 6000, "oil": 700, "natural_gas": 300}
-    fuel_cost_per_unit = fuel_cost_map.get(fuel_type, 500)
+    fuel_cost_per_unit = FUEL_COST[fuel_id]
     cost_saved = fuel_saved * fuel_cost_per_unit
 
-    co2_factor_map = {"coal": 2.42, "oil": 2.96, "natural_gas": 2.0}
-    co2_factor = co2_factor_map.get(fuel_type, 2.5)
+    co2_factor = CO2_FACTOR[fuel_id]
     co2_saved_tonnes = fuel_saved * co2_factor
 
     outputs = {
@@ -106,50 +171,67 @@ def predict_outputs(input_data):
         "recommended_efficiency":recommended_efficiency
     }
     return outputs
+
+
+def predict_outputs(input_data):
+    X = feature_matrix([input_data])
+    outputs = predict_batch(input_data['fuel_type'], X, input_data["fuel_used_current"])
+    return {key: value[0] for key, value in outputs.items()}
+
+
 sample_input = {
         "fuel_type": "coal",
         "max_capacity_mw": 150,
         "run_hours": 20,
         "fuel_used_current": 9000  # ✅ user enters actual current fuel use (kg/litres/Nm3)
     }
-def f2(no):
-    return int(no*100)/100
-
-def func1(sample_input):
-    print("📍 Fetching GPS location...\n")
-    try:
-        lat, lon = get_gps_location()
-        print(f"✅ Current Location: ({lat}, {lon})\n")
-    except Exception as e:
-        print("⚠️ Location fetch failed. Using fallback: Chennai, India.")
-        lat, lon = 13.0895, 80.2739
-
-    print("🌦️ Fetching 7-day weather forecast...\n")
+# Debug report for one forecast day, filled from predict_batch outputs
+_DAY_REPORT = (
+    "📅 Date: {date}\n"
+    "  Recommended Generation (MW): {recommended_generation_mw:.4f}\n"
+    "  Recommended Fuel Use: {fuel_used_recommended:.4f}\n"
+    "  Fuel Saved: {fuel_saved:.4f}\n"
+    "  Cost Saved: {cost_saved:.4f}\n"
+    "  CO2 Saved (tonnes): {co2_saved_tonnes:.4f}\n"
+    + "-" * 40
+)
+
+def valid_location(lat, lon):
+    """True if (lat, lon) are finite coordinates within ±90 / ±180 degrees."""
+    if lat is None or lon is None:
+        return False
+    return math.isfinite(lat) and math.isfinite(lon) and abs(lat) <= 90 and abs(lon) <= 180
+
+
+def func1(sample_input, lat=None, lon=None):
+    """7-day forecast rows; raises RuntimeError if weather data is unavailable."""
+    if not valid_location(lat, lon):
+        if lat is not None or lon is not None:
+            log.warning("⚠️ Ignoring invalid location (%s, %s); using geolocation.", lat, lon)
+        log.debug("📍 Fetching GPS location...")
+        try:
+            lat, lon = get_gps_location()
+            log.debug("✅ Current Location: (%s, %s)", lat, lon)
+        except Exception as e:
+            log.warning("⚠️ Location fetch failed (%s). Using fallback: Chennai, India.", e)
+            lat, lon = 13.0895, 80.2739
+
+    log.debug("🌦️ Fetching 7-day weather forecast...")
     try:
         forecast = fetch_weather_forecast(lat, lon, days=7)
     except Exception as e:
-        print("❌ Could not fetch weather data. Please check your internet connection or try again later.")
-        print("Error details:", e)
-        exit(1)
-
-    print("\n7-Day Plant Output Forecast:\n")
-    l=[]
-    for day in forecast:
-        input_data = sample_input.copy()
-        input_data["temp_C"] = day["temp_C"]
-        input_data["humidity_%"] = day["humidity_%"]
-        input_data["pressure_hPa"] = day["pressure_hPa"]
-
-        outputs = predict_outputs(input_data)
-
-        print(f"📅 Date: {day['date']}")
-        print(f"  Recommended Generation (MW): {outputs['recommended_generation_mw']:.4f}")
-        print(f"  Recommended Fuel Use: {outputs['fuel_used_recommended']:.4f}")
-        print(f"  Fuel Saved: {outputs['fuel_saved']:.4f}")
-        print(f"  Cost Saved: {outputs['cost_saved']:.4f}")
-        print(f"  CO2 Saved (tonnes): {outputs['co2_saved_tonnes']:.4f}")
-        print("-" * 40)
-        l.append([day['date'],f2(outputs['recommended_generation_mw']),f2(outputs['fuel_used_recommended']),\
-                f2(outputs['fuel_saved']),f2(outputs['cost_saved']),f2(outputs['co2_saved_tonnes']),\
-                    f2(outputs['recommended_efficiency'])])
+        raise RuntimeError(f"❌ Could not fetch weather data: {e}") from e
+
+    if not forecast:
+        return []
+    X = feature_matrix([{**sample_input, **day} for day in forecast])
+    batch = predict_batch(sample_input["fuel_type"], X, sample_input["fuel_used_current"])
+    # Page values, rounded to 2 decimals in one pass (columns follow predict_batch's key order)
+    rounded = np.round(np.column_stack(list(batch.values())), 2).tolist()
+    l = [[day['date']] + row for day, row in zip(forecast, rounded)]
+
+    if log.isEnabledFor(logging.DEBUG):
+        report = [_DAY_REPORT.format(date=day['date'], **dict(zip(batch, values)))
+                  for day, values in zip(forecast, zip(*batch.values()))]
+        log.debug("7-Day Plant Output Forecast:\n%s", "\n".join(report))
     return l
\ No newline at end of file
@@ -0,0 +1,37 @@
+import app
+import predict_user
+
+
+def test_app_imports_and_serves_index():
+    client = app.app.test_client()
+    assert client.get('/').status_code == 200
+
+
+def test_pages_without_result_redirect_to_index():
+    client = app.app.test_client()
+    for page in ('/analytics', '/predictions'):
+        response = client.get(page)
+        assert response.status_code == 302
+        assert response.headers['Location'].endswith('/')
+
+
+def test_invalid_location_falls_back_to_geolocation(monkeypatch):
+    seen = []
+    monkeypatch.setattr(predict_user, 'get_gps_location', lambda: (13.0, 80.0))
+    def fake_forecast(lat, lon, days=7):
+        seen.append((lat, lon))
+        return [{"date": "2026-10-14", "temp_C": 30, "humidity_%": 50, "pressure_hPa": 1010}]
+    monkeypatch.setattr(predict_user, 'fetch_weather_forecast', fake_forecast)
+    inputs = {"fuel_type": "coal", "max_capacity_mw": 150, "run_hours": 20, "fuel_used_current": 9000}
+    for lat, lon in [(float('nan'), 80.0), (999.0, 80.0), (13.0, -181.0), (13.0, None)]:
+        predict_user.func1(inputs, lat, lon)
+    assert seen == [(13.0, 80.0)] * 4
+
+
+def test_weather_failure_returns_error_page(monkeypatch):
+    def failing_forecast(lat, lon, days=7):
+        raise ValueError("400 Bad Request")
+    monkeypatch.setattr(predict_user, 'fetch_weather_forecast', failing_forecast)
+    client = app.app.test_client()
+    response = client.get('/performance?fuel=coal&runtime=20&cap=150&cur=9000&lat=13&lon=80')
+    assert response.status_code == 503
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+import generator
+
+
+class MidpointRng:
+    """Deterministic stand-in for np.random.Generator: uniform draws return the midpoint."""
+    def uniform(self, low=0.0, high=1.0, size=None):
+        return np.full(size, (low + high) / 2)
+
+    def integers(self, low, high=None, size=None, endpoint=False):
+        return np.full(size, low)
+
+
+def baseline_fuel_columns(fuel_type, config, max_capacity_mw, current_generation_mw, run_hours, efficiency):
+    """Per-fuel branch formulas from the original per-sample generator loop."""
+    base_generation = max_capacity_mw * efficiency
+    heat_rate = 860 / efficiency
+    if fuel_type == 'coal':
+        fuel_per_kwh = heat_rate / config['fuel_lhv']
+    elif fuel_type == 'oil':
+        fuel_per_kwh = heat_rate / (config['fuel_lhv'] * config['density'])
+    else:
+        fuel_per_kwh = heat_rate / config['fuel_lhv']
+    fuel_used_current = (current_generation_mw * 1000) * fuel_per_kwh * run_hours / 1000
+    fuel_used_recommended = (base_generation * 1000) * fuel_per_kwh * run_hours / 1000
+    if fuel_type == 'coal':
+        co2_saved = (fuel_used_current - fuel_used_recommended) * config['co2_factor']
+    elif fuel_type == 'oil':
+        co2_saved = (fuel_used_current * config['density'] / 1000
+                     - fuel_used_recommended * config['density'] / 1000) * config['co2_factor']
+    else:
+        co2_saved = (fuel_used_current - fuel_used_recommended) * config['co2_factor'] / 1000
+    return {
+        "fuel_per_kwh": fuel_per_kwh,
+        "fuel_used_current": fuel_used_current,
+        "fuel_used_recommended": fuel_used_recommended,
+        "fuel_saved": fuel_used_current - fuel_used_recommended,
+        "co2_saved_tonnes": co2_saved,
+    }
+
+
+@pytest.fixture
+def rows():
+    gen = generator.MultiFuelPlantGenerator()
+    gen.rng = MidpointRng()
+    return gen, gen.generate_realistic_data(num_samples=4)
+
+
+def test_row_count_and_column_types(rows):
+    gen, data = rows
+    assert len(data) == 4 * len(gen.fuel_types)
+    str_columns = {"timestamp", "fuel_type", "fuel_unit"}
+    for row in data:
+        assert len(row) == len(generator.HEADERS)
+        for header, value in zip(generator.HEADERS, row):
+            if header in str_columns:
+                assert type(value) is str, header
+            elif header == "run_hours":
+                assert type(value) is int, header
+            else:
+                assert type(value) is float, header
+
+
+def test_rows_ordered_by_timestamp_then_fuel(rows):
+    gen, data = rows
+    fuels = list(gen.fuel_types)
+    ts = generator.HEADERS.index("timestamp")
+    ft = generator.HEADERS.index("fuel_type")
+    groups = [data[i:i + len(fuels)] for i in range(0, len(data), len(fuels))]
+    for group in groups:
+        assert [row[ft] for row in group] == fuels
+        assert len({row[ts] for row in group}) == 1
+    stamps = [group[0][ts] for group in groups]
+    assert stamps == sorted(stamps) and len(set(stamps)) == len(stamps)
+
+
+def test_fuel_unit_labels(rows):
+    _, data = rows
+    ft = generator.HEADERS.index("fuel_type")
+    unit = generator.HEADERS.index("fuel_unit")
+    assert {row[ft]: row[unit] for row in data} == {'coal': 'ton', 'oil': 'barrel', 'natural_gas': '1000Nm3'}
+
+
+def test_fuel_and_co2_match_baseline_formulas(rows):
+    gen, data = rows
+    col = {header: i for i, header in enumerate(generator.HEADERS)}
+    decimals = {name: d for d, cols in generator.ROUNDING for name in generator.FLOAT_COLUMNS[cols]}
+    for row in data:
+        fuel_type = row[col["fuel_type"]]
+        config = gen.fuel_types[fuel_type]
+        # Unrounded inputs implied by the midpoint rng
+        max_capacity_mw = np.mean(config['capacity_range'])
+        current_generation_mw = max_capacity_mw * 0.8
+        expected = baseline_fuel_columns(
+            fuel_type, config, max_capacity_mw, current_generation_mw,
+            row[col["run_hours"]], row[col["predicted_efficiency"]]
+        )
+        for name, value in expected.items():
+            assert row[col[name]] == pytest.approx(round(value, decimals[name]), abs=10.0 ** -decimals[name]), name
+
+
+def test_efficiency_core_matches_baseline_formula():
+    config = generator.MultiFuelPlantGenerator().fuel_types['coal']
+    min_eff, max_eff = config['efficiency_range']
+    base = np.mean(config['efficiency_range'])
+    for temp_C, humidity, pressure, run_hours, days, load in [
+        (30.0, 50.0, 1010.0, 2, 2000, 0.9), (18.0, 35.0, 1020.0, 6, 2100, 0.7), (25.0, 60.0, 1000.0, 20, 2200, 1.0)
+    ]:
+        hours_factor = 0.95 if run_hours < 4 else 0.98 if run_hours < 8 else 1.0 + 0.00005 * (run_hours - 8)
+        expected = (base * (1 - abs(load - 0.9) * 0.08)
+                    * (1 - config['temp_sensitivity'] * (temp_C - 25))
+                    * (1 - config['humidity_sensitivity'] * (humidity - 40))
+                    * (1 + config['pressure_sensitivity'] * (pressure - 1013.25))
+                    * hours_factor * (1 - days * 0.00005))
+        expected = max(min_eff, min(max_eff, expected))
+        actual = generator._efficiency_core(
+            base, config['temp_sensitivity'], config['humidity_sensitivity'], config['pressure_sensitivity'],
+            min_eff, max_eff, temp_C, humidity, pressure, run_hours, days, load
+        )
+        assert actual == pytest.approx(expected, rel=1e-12)
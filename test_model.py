@@ -1,8 +1,6 @@
-import random
 import numpy as np
 import pandas as pd
 from joblib import load
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -11,77 +9,69 @@ MODEL_FILE = "coal_adjustment_model.joblib"
 class ThermalPlantDataGenerator:
     def __init__(self):
         self.plant_types = {
-            'subcritical': {'efficiency_range': (0.32, 0.38), 'heat_rate_range': (2400, 2600)},
-            'supercritical': {'efficiency_range': (0.38, 0.42), 'heat_rate_range': (2200, 2400)},
-            'ultra_supercritical': {'efficiency_range': (0.42, 0.46), 'heat_rate_range': (2000, 2200)}
+            'subcritical': {'efficiency_range': (0.32, 0.38), 'heat_rate_range': (2400, 2600), 'capacity_range': (200, 500)},
+            'supercritical': {'efficiency_range': (0.38, 0.42), 'heat_rate_range': (2200, 2400), 'capacity_range': (300, 600)},
+            'ultra_supercritical': {'efficiency_range': (0.42, 0.46), 'heat_rate_range': (2000, 2200), 'capacity_range': (400, 800)}
         }
+        # Per-type ranges as arrays, indexed by plant type id
+        self.efficiency_ranges = np.array([config['efficiency_range'] for config in self.plant_types.values()])
+        self.capacity_ranges = np.array([config['capacity_range'] for config in self.plant_types.values()])
+        self.rng = np.random.default_rng()
         
-    def generate_plant_config(self):
-        plant_type = random.choice(list(self.plant_types.keys()))
-        config = self.plant_types[plant_type]
-        if plant_type == 'subcritical':
-            max_capacity = random.uniform(200, 500)
-        elif plant_type == 'supercritical':
-            max_capacity = random.uniform(300, 600)
-        else:
-            max_capacity = random.uniform(400, 800)
-        return plant_type, max_capacity, config
+    def generate_plant_config(self, n):
+        plant_type_idx = self.rng.integers(0, len(self.plant_types), size=n)
+        low, high = self.capacity_ranges[plant_type_idx].T
+        max_capacity = self.rng.uniform(size=n) * (high - low) + low
+        return plant_type_idx, max_capacity
     
-    def calculate_efficiency_from_physics(self, temp_C, humidity, pressure_hPa, run_hours, plant_type):
-        base_efficiency = self.plant_types[plant_type]['efficiency_range'][1]
+    def calculate_efficiency_from_physics(self, temp_C, humidity, pressure_hPa, run_hours, plant_type_idx):
+        n = len(plant_type_idx)
+        min_eff, max_eff = self.efficiency_ranges[plant_type_idx].T
+        base_efficiency = max_eff
         temp_factor = 1 - 0.002 * (temp_C - 25)
         humidity_factor = 1 - 0.001 * (humidity - 40)
         pressure_factor = 1 + 0.0005 * (pressure_hPa - 1013.25)
         hours_factor = 1 + 0.0001 * (run_hours - 12)
-        degradation_factor = random.uniform(0.95, 1.0)
+        degradation_factor = self.rng.uniform(0.95, 1.0, size=n)
         efficiency = base_efficiency * temp_factor * humidity_factor * pressure_factor * hours_factor * degradation_factor
-        efficiency *= random.uniform(0.98, 1.02)
-        min_eff, max_eff = self.plant_types[plant_type]['efficiency_range']
-        efficiency = max(min_eff, min(max_eff, efficiency))
-        return round(efficiency, 4)
+        efficiency *= self.rng.uniform(0.98, 1.02, size=n)
+        efficiency = np.clip(efficiency, min_eff, max_eff)
+        return np.round(efficiency, 4)
     
     def generate_realistic_data(self, num_samples=200):
-        data = []
-        for _ in range(num_samples):
-            plant_type, max_capacity_mw, config = self.generate_plant_config()
-            temp_C = random.uniform(15, 45)
-            humidity = random.uniform(20, 80)
-            pressure_hPa = random.uniform(980, 1030)
-            run_hours = random.randint(8, 24)
-            predicted_efficiency = self.calculate_efficiency_from_physics(
-                temp_C, humidity, pressure_hPa, run_hours, plant_type
-            )
-            base_generation = max_capacity_mw * predicted_efficiency
-            variation = random.uniform(0.85, 1.15)
-            current_generation_mw = min(max_capacity_mw, base_generation * variation)
-            heat_rate_kcal_per_kwh = 860 / predicted_efficiency
-            coal_per_kwh_kg = heat_rate_kcal_per_kwh / 7000
-            coal_used_current_tonnes = (current_generation_mw * run_hours * coal_per_kwh_kg) / 1000
-            recommended_generation_mw = max_capacity_mw * predicted_efficiency
-            adjustment_pct = (recommended_generation_mw - current_generation_mw) / max_capacity_mw * 100
-            coal_used_recommended_tonnes = (recommended_generation_mw * run_hours * coal_per_kwh_kg) / 1000
-            coal_saved_tonnes = coal_used_current_tonnes - coal_used_recommended_tonnes
-            coal_cost_per_ton = random.uniform(5000, 7000)
-            cost_saved = coal_saved_tonnes * coal_cost_per_ton
-            co2_saved_tonnes = coal_saved_tonnes * 2.42
-            data.append({
-                "max_capacity_mw": max_capacity_mw,
-                "current_generation_mw": current_generation_mw,
-                "run_hours": run_hours,
-                "temp_C": temp_C,
-                "humidity_%": humidity,
-                "pressure_hPa": pressure_hPa,
-                "predicted_efficiency": predicted_efficiency
-            })
-        return pd.DataFrame(data)
+        n = num_samples
+        plant_type_idx, max_capacity_mw = self.generate_plant_config(n)
+        temp_C = self.rng.uniform(15, 45, size=n)
+        humidity = self.rng.uniform(20, 80, size=n)
+        pressure_hPa = self.rng.uniform(980, 1030, size=n)
+        run_hours = self.rng.integers(8, 24, size=n, endpoint=True)
+        predicted_efficiency = self.calculate_efficiency_from_physics(
+            temp_C, humidity, pressure_hPa, run_hours, plant_type_idx
+        )
+        base_generation = max_capacity_mw * predicted_efficiency
+        variation = self.rng.uniform(0.85, 1.15, size=n)
+        current_generation_mw = np.minimum(max_capacity_mw, base_generation * variation)
+        return pd.DataFrame({
+            "max_capacity_mw": max_capacity_mw,
+            "current_generation_mw": current_generation_mw,
+            "run_hours": run_hours,
+            "temp_C": temp_C,
+            "humidity_%": humidity,
+            "pressure_hPa": pressure_hPa,
+            "predicted_efficiency": predicted_efficiency
+        })
 
-def evaluate_model_accuracy(model, X_test, y_test):
-    y_pred = model.predict(X_test)
-    mae = mean_absolute_error(y_test, y_pred)
-    mse = mean_squared_error(y_test, y_pred)
+def evaluate_model_accuracy(model, X_test, y_test, num_runs=1):
+    """Per-run metric arrays for `num_runs` equal-sized test sets stacked in X_test/y_test."""
+    y_true = np.asarray(y_test).reshape(num_runs, -1)
+    y_pred = np.asarray(model.predict(X_test)).reshape(num_runs, -1)
+    err = y_true - y_pred
+    mae = np.mean(np.abs(err), axis=1)
+    mse = np.mean(err ** 2, axis=1)
     rmse = np.sqrt(mse)
-    r2 = r2_score(y_test, y_pred)
-    accuracy_pct = (1 - np.mean(np.abs((y_test - y_pred) / y_test))) * 100
+    ss_tot = np.sum((y_true - y_true.mean(axis=1, keepdims=True)) ** 2, axis=1)
+    r2 = 1 - np.sum(err ** 2, axis=1) / ss_tot
+    accuracy_pct = (1 - np.mean(np.abs(err / y_true), axis=1)) * 100
     return {'MAE': mae, 'MSE': mse, 'RMSE': rmse, 'R2_Score': r2, 'Accuracy_Percentage': accuracy_pct}
 
 def main():
@@ -93,20 +83,18 @@ def main():
         print("Model file not found. Please train first.")
         return
     generator = ThermalPlantDataGenerator()
-    metrics_list = []
     NUM_TESTS = 10
-    for i in range(NUM_TESTS):
-        test_data = generator.generate_realistic_data(num_samples=200)
-        features = ["max_capacity_mw", "current_generation_mw", "run_hours", "temp_C", "humidity_%", "pressure_hPa"]
-        X_test = test_data[features]
-        y_test = test_data["predicted_efficiency"]
-        metrics = evaluate_model_accuracy(model, X_test, y_test)
-        metrics_list.append(metrics)
-        print(f"Test {i+1}: R2={metrics['R2_Score']:.4f}, MAE={metrics['MAE']:.5f}, Accuracy={metrics['Accuracy_Percentage']:.2f}%")
-    avg_metrics = {
-        key: np.mean([m[key] for m in metrics_list])
-        for key in metrics_list[0]
-    }
+    # All test sets generated and scored in one pass, then split back into runs
+    test_data = generator.generate_realistic_data(num_samples=NUM_TESTS * 200)
+    features = ["max_capacity_mw", "current_generation_mw", "run_hours", "temp_C", "humidity_%", "pressure_hPa"]
+    X_test = test_data[features]
+    y_test = test_data["predicted_efficiency"]
+    metrics = evaluate_model_accuracy(model, X_test, y_test, num_runs=NUM_TESTS)
+    print("\n".join(
+        "Test {}: R2={:.4f}, MAE={:.5f}, Accuracy={:.2f}%".format(i + 1, r2, mae, acc)
+        for i, (r2, mae, acc) in enumerate(zip(metrics['R2_Score'], metrics['MAE'], metrics['Accuracy_Percentage']))
+    ))
+    avg_metrics = {key: values.mean() for key, values in metrics.items()}
     print("\n" + "="*50)
     print("AVERAGE MODEL PERFORMANCE AFTER 10 TESTS:")
     print(f"R² Score       : {avg_metrics['R2_Score']:.4f}")
@@ -31,7 +31,7 @@ for fuel, model_file in MODEL_FILES.items():
     model = joblib.load(model_file)
 
     # Predict
-    predicted = model.predict(sample_input)[0]
+    predicted = model.predict(sample_input.to_numpy())[0]
 
     # Calculate difference
     diff = current_generation - predicted
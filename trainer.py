@@ -1,5 +1,6 @@
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import r2_score, mean_absolute_error
 import joblib
@@ -12,32 +13,45 @@ if not os.path.exists(CSV_FILE) or os.stat(CSV_FILE).st_size == 0:
     print("No data available for training.")
     exit()
 
-df = pd.read_csv(CSV_FILE)
-
 # Features to use
 FEATURES = ["max_capacity_mw", "run_hours", "temp_C", "humidity_%", "pressure_hPa"]
 
+# Only parse the columns training needs, with explicit dtypes
+COLUMN_DTYPES = {
+    "fuel_type": "category",
+    "max_capacity_mw": "float32",
+    "run_hours": "int16",
+    "temp_C": "float32",
+    "humidity_%": "float32",
+    "pressure_hPa": "float32",
+    "current_generation_mw": "float32",
+}
+
+df = pd.read_csv(CSV_FILE, usecols=list(COLUMN_DTYPES), dtype=COLUMN_DTYPES, engine="c")
+
 # Train a model for each fuel type
-for fuel in df['fuel_type'].unique():
-    fuel_df = df[df['fuel_type'] == fuel]
+for fuel, fuel_df in df.groupby("fuel_type", observed=True):
 
     # Skip if not enough data
     if len(fuel_df) < 5:
         print(f"⚠️ Skipping {fuel} - not enough samples ({len(fuel_df)})")
         continue
 
-    X = fuel_df[FEATURES]
-    y = fuel_df["current_generation_mw"]
+    # Plain arrays: models are fed NumPy input at prediction time
+    X = fuel_df[FEATURES].to_numpy(dtype=np.float32)
+    y = fuel_df["current_generation_mw"].to_numpy(dtype=np.float32)
 
     # Train-test split for validation
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-    # Train RandomForest efficiently
-    model = RandomForestRegressor(
-        n_estimators=200,   # more trees → better accuracy, still efficient
-        random_state=42,
-        n_jobs=-1,          # use all CPU cores
-        max_depth=12        # limit depth → faster & less overfitting
+    # Train gradient-boosted trees on binned features → small model, fast predict
+    model = HistGradientBoostingRegressor(
+        max_iter=200,        # upper bound on boosting rounds
+        max_depth=8,         # shallow trees → fewer node traversals per prediction
+        learning_rate=0.1,
+        min_samples_leaf=5,  # keep leaves usable on small per-fuel datasets
+        early_stopping=True, # stop once the validation score plateaus
+        random_state=42
     )
     model.fit(X_train, y_train)
 
@@ -49,8 +63,8 @@ for fuel in df['fuel_type'].unique():
     print(f"✅ Trained model for {fuel}: R²={r2:.3f}, MAE={mae:.2f}")
 
     # Save
-    joblib.dump(model, f"model_{fuel}.joblib")
+    joblib.dump(model, f"model_{fuel}.joblib", compress=3)
 
-# Clear CSV after training (keep headers)
-df.iloc[0:0].to_csv(CSV_FILE, index=False)
+# Clear CSV after training (keep all headers, not just the loaded columns)
+pd.read_csv(CSV_FILE, nrows=0).to_csv(CSV_FILE, index=False)
 print("Training data cleared for fresh collection.")